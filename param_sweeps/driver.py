@@ -15,18 +15,21 @@ import importlib
 import inspect
 import itertools
 import json
+import math
 import shutil
+import time
 import uuid
+import warnings
 from dataclasses import dataclass
 from inspect import signature
 from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
-from geoh5py.shared.exceptions import BaseValidationError
-from geoh5py.ui_json import InputFile
-from geoh5py.workspace import Workspace
+
+if TYPE_CHECKING:
+    from geoh5py.ui_json import InputFile
+    from geoh5py.workspace import Workspace
 
 
 @dataclass
@@ -79,6 +82,8 @@ class SweepParams:
     def parameter_sets(self) -> dict:
         """Return sets of parameter values that will be combined to form the sweep."""
 
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
         names = self.worker_parameters()
 
         sets = {}
@@ -96,10 +101,62 @@ class SweepParams:
         return sets
 
 
+@dataclass
+class SweepPlan:
+    """Projected resources of a sweep, computed without writing any files."""
+
+    trials: int
+    pending: int
+    remaining: int
+    trial_size: int
+    disk_free: int
+    trial_duration: float | None = None
+    concurrency: int = 1
+    batch_size: int = 1
+
+    @property
+    def disk_usage(self) -> int:
+        """Bytes needed to clone the workspace for every pending batch of trials."""
+        return math.ceil(self.pending / max(self.batch_size, 1)) * self.trial_size
+
+    @property
+    def fits(self) -> bool:
+        """Whether the projected disk usage fits in the available space."""
+        return self.disk_usage <= self.disk_free
+
+    @property
+    def runtime(self) -> float | None:
+        """Estimated wall time in seconds, if trial durations are known."""
+        if self.trial_duration is None:
+            return None
+
+        waves = math.ceil(self.remaining / max(self.concurrency, 1))
+        return waves * self.trial_duration
+
+    def summary(self) -> str:
+        """Human readable report of the plan."""
+        runtime = (
+            "unknown (no recorded trial durations)"
+            if self.runtime is None
+            else f"{self.runtime:.1f} s at concurrency {self.concurrency}"
+        )
+        return "\n".join(
+            [
+                f"Trials: {self.trials} ({self.pending} to write, "
+                f"{self.remaining} to run)",
+                f"Disk usage: {self.disk_usage / 1e6:.1f} MB "
+                f"({self.trial_size / 1e6:.1f} MB per copy, "
+                f"{self.batch_size} trials per copy)",
+                f"Disk free: {self.disk_free / 1e6:.1f} MB",
+                f"Estimated runtime: {runtime}",
+            ]
+        )
+
+
 class SweepDriver:
     """Sweeps parameters of a worker driver."""
 
-    def __init__(self, params: SweepParams):
+    def __init__(self, params: SweepParams, dry_run: bool = False, batch_size: int = 1):
         if params.geoh5 is None:
             raise ValueError("Workspace must be specified.")
 
@@ -110,8 +167,10 @@ class SweepDriver:
             raise ValueError("Workspace must be saved to disk.")
 
         self.working_directory = str(Path(self.workspace.h5file).parent)
-        lookup = self.get_lookup()
-        self.write_files(lookup)
+        self.batch_size = max(batch_size, 1)
+        if not dry_run:
+            lookup = self.get_lookup()
+            self.write_files(lookup)
 
     @staticmethod
     def uuid_from_params(params: tuple) -> str:
@@ -124,9 +183,63 @@ class SweepDriver:
         """
         return str(uuid.uuid5(uuid.NAMESPACE_DNS, str(hash(params))))
 
+    @staticmethod
+    def uuid_from_trials(names: list[str]) -> str:
+        """
+        Create a deterministic uuid for a batch of trials.
+
+        :param names: Uuids of the trials in the batch.
+
+        :returns: Unique but recoverable uuid file identifier string.
+        """
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, ",".join(names)))
+
+    @staticmethod
+    def trial_parameters(trial: dict) -> dict:
+        """
+        Worker parameters of a trial, without the bookkeeping of the lookup table.
+
+        :param trial: Lookup table entry of a trial.
+
+        :returns: Parameter values by name.
+        """
+        return {
+            key: val
+            for key, val in trial.items()
+            if key not in ["status", "duration", "batch"]
+        }
+
+    @staticmethod
+    def unwritten(lookup: dict) -> list[str]:
+        """
+        Trials needing a fresh copy of the worker workspace.
+
+        Besides new trials, this includes those that failed or were
+        interrupted, as a killed worker may have left their workspace corrupt.
+
+        :param lookup: Lookup table of trial parameters and status, by uuid.
+
+        :returns: Uuids of the trials.
+        """
+        return [
+            name
+            for name, trial in lookup.items()
+            if trial["status"] not in ["written", "complete"]
+        ]
+
     def get_lookup(self):
         """Generate lookup table for sweep trials."""
 
+        lookup = self.trials()
+        lookup = self.update_lookup(lookup)
+        return lookup
+
+    def trials(self) -> dict:
+        """
+        Gather the sweep trials, merged with those of any previous run.
+
+        :returns: Lookup table of trial parameters and status, by uuid.
+        """
         lookup = {}
         sets = self.params.parameter_sets()
         iterations = list(itertools.product(*sets.values()))
@@ -135,36 +248,140 @@ class SweepDriver:
             lookup[param_uuid] = dict(zip(sets.keys(), iteration, strict=False))
             lookup[param_uuid]["status"] = "pending"
 
-        lookup = self.update_lookup(lookup, gather_first=True)
+        lookup.update(self.read_lookup())  # In case restarting
+
         return lookup
 
-    def update_lookup(self, lookup: dict, gather_first: bool = False):
-        """Updates lookup with new entries. Ensures any previous runs are incorporated."""
+    def read_lookup(self) -> dict:
+        """Read the lookup table of a previous run, if any."""
         lookup_path = Path(self.working_directory) / "lookup.json"
-        if lookup_path.is_file() and gather_first:  # In case restarting
-            with open(lookup_path, encoding="utf8") as file:
-                lookup.update(json.load(file))
+        if not lookup_path.is_file():
+            return {}
 
+        with open(lookup_path, encoding="utf8") as file:
+            return json.load(file)
+
+    def update_lookup(self, lookup: dict):
+        """Write the lookup table of the sweep trials."""
+        lookup_path = Path(self.working_directory) / "lookup.json"
         with open(lookup_path, "w", encoding="utf8") as file:
             json.dump(lookup, file, indent=4)
 
         return lookup
 
+    def plan(
+        self, concurrency: int = 1, trial_duration: float | None = None
+    ) -> SweepPlan:
+        """
+        Project the resources needed by the sweep without writing any files.
+
+        :param concurrency: Number of trials expected to run simultaneously.
+        :param trial_duration: Seconds per trial. Defaults to the mean of the
+            durations recorded by previous runs, if any.
+
+        :returns: Plan of the sweep.
+        """
+        lookup = self.trials()
+        durations = [
+            trial["duration"] for trial in lookup.values() if "duration" in trial
+        ]
+        if trial_duration is None and durations:
+            trial_duration = sum(durations) / len(durations)
+
+        ifile = self.worker_input_file()
+        if ifile.data is None:
+            raise ValueError("Input file data is empty.")
+
+        if self.batch_size > 1:
+            worker_batch_driver(ifile.data["run_command"])
+
+        return SweepPlan(
+            trials=len(lookup),
+            pending=len(self.unwritten(lookup)),
+            remaining=sum(k["status"] != "complete" for k in lookup.values()),
+            trial_size=self.trial_size(ifile),
+            disk_free=shutil.disk_usage(self.trial_directory(ifile)).free,
+            trial_duration=trial_duration,
+            concurrency=concurrency,
+            batch_size=self.batch_size,
+        )
+
+    def worker_input_file(self) -> InputFile:
+        """Read the ui.json of the worker application."""
+        from geoh5py.ui_json import InputFile  # pylint: disable=import-outside-toplevel
+
+        if self.params.worker_uijson is None:
+            raise ValueError("Worker ui.json must be specified.")
+
+        return InputFile.read_ui_json(self.params.worker_uijson)
+
+    @staticmethod
+    def trial_directory(ifile: InputFile) -> Path:
+        """
+        Directory where the trial copies of the worker workspace are written.
+
+        :param ifile: Worker input file.
+
+        :returns: Directory of the worker geoh5 file.
+        """
+        if ifile.data is None:
+            raise ValueError("Input file data is empty.")
+
+        return Path(ifile.data["geoh5"].h5file).parent
+
+    @staticmethod
+    def trial_size(ifile: InputFile) -> int:
+        """
+        Bytes written to disk for each trial, or batch of trials, of the worker.
+
+        :param ifile: Worker input file.
+
+        :returns: Size of the worker geoh5 and ui.json files.
+        """
+        if ifile.data is None:
+            raise ValueError("Input file data is empty.")
+
+        size = Path(ifile.data["geoh5"].h5file).stat().st_size
+        if ifile.path_name is not None and Path(ifile.path_name).is_file():
+            size += Path(ifile.path_name).stat().st_size
+
+        return size
+
     def write_files(self, lookup):
         """Write ui.geoh5 and ui.json files for sweep trials."""
+        ifile = self.worker_input_file()
+        if ifile.data is None:
+            raise ValueError("Input file data is empty.")
 
-        ifile = InputFile.read_ui_json(self.params.worker_uijson)
-        with ifile.data["geoh5"].open(mode="r") as workspace:
-            for name, trial in lookup.items():
-                if trial["status"] != "pending":
-                    continue
+        if self.batch_size > 1:
+            worker_batch_driver(ifile.data["run_command"])
+
+        pending = self.unwritten(lookup)
+        batches = [
+            pending[i : i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+        required = len(batches) * self.trial_size(ifile)
+        directory = self.trial_directory(ifile)
+        available = shutil.disk_usage(directory).free
+        if required > available:
+            raise OSError(
+                f"Sweep requires {required / 1e6:.1f} MB to write {len(pending)} "
+                f"trials but only {available / 1e6:.1f} MB is available in "
+                f"{directory}."
+            )
 
+        with ifile.data["geoh5"].open(mode="r") as workspace:
+            for names in batches:
+                name = (
+                    names[0] if self.batch_size == 1 else self.uuid_from_trials(names)
+                )
                 iter_h5file = str(Path(workspace.h5file).parent / f"{name}.ui.geoh5")
                 shutil.copy(workspace.h5file, iter_h5file)
 
                 ifile.data.update(
                     dict(
-                        {key: val for key, val in trial.items() if key != "status"},
+                        self.trial_parameters(lookup[names[0]]),
                         **{"geoh5": iter_h5file},
                     )
                 )
@@ -172,36 +389,129 @@ class SweepDriver:
                 ifile.name = f"{name}.ui.json"
                 ifile.path = str(Path(workspace.h5file).parent)
                 ifile.write_ui_json()
-                lookup[name]["status"] = "written"
+                for trial in names:
+                    lookup[trial]["status"] = "written"
+                    if self.batch_size > 1:
+                        lookup[trial]["batch"] = name
+                    else:
+                        lookup[trial].pop("batch", None)
 
         _ = self.update_lookup(lookup)
 
     def run(self):
         """Execute a sweep."""
+        from geoh5py.ui_json import InputFile  # pylint: disable=import-outside-toplevel
 
-        lookup_path = Path(self.working_directory) / "lookup.json"
-        with open(lookup_path, encoding="utf8") as file:
-            lookup = json.load(file)
+        lookup = self.read_lookup()
 
+        batches: dict[str, list[str]] = {}
         for name, trial in lookup.items():
+            if trial["status"] != "complete":
+                batches.setdefault(trial.get("batch", name), []).append(name)
+
+        for batch, names in batches.items():
             ifile = InputFile.read_ui_json(
-                Path(self.working_directory) / f"{name}.ui.json"
+                Path(self.working_directory) / f"{batch}.ui.json"
             )
-            status = trial.pop("status")
-            if status != "complete":
+            for name in names:
                 lookup[name]["status"] = "processing"
-                self.update_lookup(lookup)
+            self.update_lookup(lookup)
+
+            start = time.perf_counter()
+            if "batch" in lookup[names[0]]:
+                call_worker_batch(
+                    ifile, {name: self.trial_parameters(lookup[name]) for name in names}
+                )
+            else:
                 call_worker(ifile)
+
+            duration = (time.perf_counter() - start) / len(names)
+            for name in names:
+                lookup[name]["duration"] = duration
                 lookup[name]["status"] = "complete"
-                self.update_lookup(lookup)
+            self.update_lookup(lookup)
 
+    def run_subprocess(self, concurrency: int = 1, timeout: float | None = None):
+        """
+        Execute a sweep with each trial run as a subprocess of its worker.
 
-def call_worker(ifile: InputFile):
-    """Runs the worker for the sweep parameters contained in 'ifile'."""
-    if ifile.data is None:
-        raise ValueError("Input file data is empty.")
+        :param concurrency: Maximum number of trials run simultaneously.
+        :param timeout: Seconds after which a trial is killed and marked failed.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        lookup = self.read_lookup()
+
+        if any(
+            "batch" in trial and trial["status"] != "complete"
+            for trial in lookup.values()
+        ):
+            raise ValueError("Batched trials cannot be run as subprocesses.")
+
+        asyncio.run(self.dispatch(lookup, concurrency, timeout))
+
+        failed = [name for name, trial in lookup.items() if trial["status"] == "failed"]
+        if failed:
+            warnings.warn(
+                f"{len(failed)} of {len(lookup)} trials failed. "
+                f"See the trial log files in {self.working_directory}."
+            )
+
+    async def dispatch(
+        self, lookup: dict, concurrency: int = 1, timeout: float | None = None
+    ):
+        """
+        Run the incomplete trials of 'lookup' concurrently as subprocesses.
+
+        :param lookup: Lookup table of trial parameters and status, by uuid.
+        :param concurrency: Maximum number of trials run simultaneously.
+        :param timeout: Seconds after which a trial is killed and marked failed.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        from param_sweeps.runner import call_worker_subprocess  # pylint: disable=import-outside-toplevel
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        lock = asyncio.Lock()
+
+        async def update(name: str, **values):
+            lookup[name].update(values)
+            snapshot = {key: dict(trial) for key, trial in lookup.items()}
+            async with lock:
+                await asyncio.to_thread(self.update_lookup, snapshot)
+
+        async def trial(name: str):
+            async with semaphore:
+                await update(name, status="processing")
+                start = time.perf_counter()
+                try:
+                    code = await call_worker_subprocess(
+                        Path(self.working_directory) / f"{name}.ui.json", timeout
+                    )
+                except Exception:  # pylint: disable=broad-exception-caught  # noqa: BLE001
+                    # Reported in the trial log, the other trials carry on
+                    code = None
+
+                if code == 0:
+                    await update(
+                        name,
+                        status="complete",
+                        duration=time.perf_counter() - start,
+                    )
+                else:
+                    await update(name, status="failed")
+
+        await asyncio.gather(
+            *(
+                trial(name)
+                for name, values in lookup.items()
+                if values["status"] != "complete"
+            )
+        )
 
-    run_cmd = ifile.data["run_command"]
+
+def worker_driver(run_cmd: str) -> Any:
+    """Return the driver class of the worker module 'run_cmd'."""
     module = importlib.import_module(run_cmd)
 
     def filt(member: Any) -> bool:
@@ -211,38 +521,175 @@ def call_worker(ifile: InputFile):
             and hasattr(member, "run")
         )
 
-    driver = inspect.getmembers(module, filt)[0][1]
+    return inspect.getmembers(module, filt)[0][1]
+
+
+def worker_batch_driver(run_cmd: str) -> Any:
+    """
+    Return the driver class of the worker module 'run_cmd', if it runs batches.
+
+    Workers processing a batch of trials against a shared workspace implement a
+    'start_batch(filepath, trials)' class method. Other workers assume they own
+    the workspace, so their trials cannot be batched.
+    """
+    driver = worker_driver(run_cmd)
+    if not hasattr(driver, "start_batch"):
+        raise ValueError(
+            f"Worker '{run_cmd}' does not implement 'start_batch' and cannot run "
+            "batches of trials. Use a batch size of 1."
+        )
+
+    return driver
+
+
+def call_worker(ifile: InputFile):
+    """Runs the worker for the sweep parameters contained in 'ifile'."""
+    if ifile.data is None:
+        raise ValueError("Input file data is empty.")
+
+    driver = worker_driver(ifile.data["run_command"])
     driver.start(ifile.path_name)
 
 
-def file_validation(filepath: str | Path):
-    """Validate file."""
-    if "".join(Path(filepath).suffixes) == ".ui.json":
-        try:
-            InputFile.read_ui_json(filepath)
-        except BaseValidationError as err:
-            raise OSError(
-                f"File argument {filepath} is not a valid ui.json file."
-            ) from err
-    else:
-        raise OSError(f"File argument {filepath} must have extension 'ui.json'.")
+def call_worker_batch(ifile: InputFile, trials: dict[str, dict]):
+    """
+    Runs the worker for a batch of sweep trials sharing the workspace of 'ifile'.
+
+    :param ifile: Input file of the batch.
+    :param trials: Worker parameters of the trials, by uuid.
+    """
+    if ifile.data is None:
+        raise ValueError("Input file data is empty.")
+
+    driver = worker_batch_driver(ifile.data["run_command"])
+    driver.start_batch(ifile.path_name, trials)
+
+
+def file_validation(filepath: str | Path) -> InputFile:
+    """
+    Validate file.
 
+    :param filepath: Path to a ui.json file.
 
-def main(file_path: str | Path):
-    """Run the program."""
+    :returns: The validated input file.
+    """
+    from geoh5py.shared.exceptions import BaseValidationError  # pylint: disable=import-outside-toplevel
+    from geoh5py.ui_json import InputFile  # pylint: disable=import-outside-toplevel
+
+    if "".join(Path(filepath).suffixes) != ".ui.json":
+        raise OSError(f"File argument {filepath} must have extension 'ui.json'.")
+
+    try:
+        return InputFile.read_ui_json(filepath)
+    except BaseValidationError as err:
+        raise OSError(f"File argument {filepath} is not a valid ui.json file.") from err
+
+
+def main(  # pylint: disable=R0913
+    file_path: str | Path,
+    *,
+    plan: bool = False,
+    concurrency: int = 1,
+    trial_duration: float | None = None,
+    use_subprocess: bool = False,
+    timeout: float | None = None,
+    batch_size: int = 1,
+):
+    """
+    Run the program.
+
+    :param file_path: Path to the sweep ui.json file.
+    :param plan: Only report the projected resources of the sweep.
+    :param concurrency: Number of trials run simultaneously as subprocesses.
+    :param trial_duration: Seconds per trial used for the runtime estimate.
+    :param use_subprocess: Run each trial as a subprocess of its worker.
+    :param timeout: Seconds after which a subprocess trial is killed.
+    :param batch_size: Number of trials processed by each worker call.
+    """
+    if use_subprocess and batch_size > 1:
+        raise ValueError("Batched trials cannot be run as subprocesses.")
+
+    if not use_subprocess and (concurrency != 1 or timeout is not None):
+        raise ValueError(
+            "Concurrency and timeout only apply to trials run as subprocesses."
+        )
 
-    file_validation(file_path)
     print("Reading parameters and workspace...")
-    input_file = InputFile.read_ui_json(file_path)
+    input_file = file_validation(file_path)
     sweep_params = SweepParams.from_input_file(input_file)
-    SweepDriver(sweep_params).run()
+
+    if plan:
+        sweep_plan = SweepDriver(
+            sweep_params, dry_run=True, batch_size=batch_size
+        ).plan(concurrency=concurrency, trial_duration=trial_duration)
+        print(sweep_plan.summary())
+        if not sweep_plan.fits:
+            warnings.warn(
+                "Projected disk usage exceeds the available space; "
+                "the sweep will refuse to start."
+            )
+        return sweep_plan
+
+    driver = SweepDriver(sweep_params, batch_size=batch_size)
+    if use_subprocess:
+        driver.run_subprocess(concurrency=concurrency, timeout=timeout)
+    else:
+        driver.run()
+
+    return None
 
 
+# The CLI is launched many times by job schedulers: geoh5py, numpy and asyncio
+# are imported inside the functions using them to keep its startup fast.
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Run parameter sweep of worker driver."
     )
     parser.add_argument("file", help="File with ui.json format.")
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Report trial count, disk usage and runtime without running.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of trials run simultaneously with --subprocess.",
+    )
+    parser.add_argument(
+        "--trial-duration",
+        type=float,
+        default=None,
+        help="Seconds per trial, overriding durations recorded by previous runs.",
+    )
+
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Run each trial as a subprocess in the worker conda environment.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds after which a subprocess trial is killed and marked failed.",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of trials processed by each worker call, sharing a workspace.",
+    )
 
     args = parser.parse_args()
-    main(Path(args.file).resolve(strict=True))
+    main(
+        Path(args.file).resolve(strict=True),
+        plan=args.plan,
+        concurrency=args.concurrency,
+        trial_duration=args.trial_duration,
+        use_subprocess=args.subprocess,
+        timeout=args.timeout,
+        batch_size=args.batch_size,
+    )
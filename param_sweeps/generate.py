@@ -15,8 +15,6 @@ import re
 from copy import deepcopy
 from pathlib import Path
 
-from geoh5py.ui_json import InputFile
-
 from param_sweeps.constants import default_ui_json
 
 
@@ -32,6 +30,7 @@ def generate(
     :param parameters: Parameters to include in the _sweep.ui.json file
     :param update_values: Updates for sweep files parameters
     """
+    from geoh5py.ui_json import InputFile  # pylint: disable=import-outside-toplevel
 
     file_path = Path(worker).resolve(strict=True)
     ifile = InputFile.read_ui_json(file_path)
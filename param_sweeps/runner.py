@@ -0,0 +1,184 @@
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2022-2025 Mira Geoscience Ltd.                                   '
+#                                                                                 '
+#  This file is part of param-sweeps package.                                     '
+#                                                                                 '
+#  param-sweeps is distributed under the terms and conditions of the MIT License  '
+#  (see LICENSE file at the root of this source code package).                    '
+#                                                                                 '
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+
+from __future__ import annotations
+
+import codecs
+import contextlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def worker_command(uijson: str | Path) -> list[str]:
+    """
+    Command line running the worker of a trial ui.json file.
+
+    The worker is launched with 'conda run' when the file names a conda
+    environment other than the active one, and with the current interpreter
+    otherwise. A warning is issued if conda is needed but cannot be found.
+
+    :param uijson: Path to the trial ui.json file.
+
+    :returns: Command and arguments for the worker subprocess.
+    """
+    with open(uijson, encoding="utf8") as file:
+        data = json.load(file)
+
+    command = ["-m", data["run_command"], str(uijson)]
+    environment = data.get("conda_environment")
+    conda = os.environ.get("CONDA_EXE") or shutil.which("conda")
+
+    if environment and environment != os.environ.get("CONDA_DEFAULT_ENV"):
+        if conda is None:
+            warnings.warn(
+                f"Conda not found to run {uijson} in environment '{environment}'; "
+                f"running it with {sys.executable} instead."
+            )
+            return [sys.executable, *command]
+
+        return [
+            conda,
+            "run",
+            "--no-capture-output",
+            "-n",
+            environment,
+            "python",
+            *command,
+        ]
+
+    return [sys.executable, *command]
+
+
+async def stream_output(stream: asyncio.StreamReader, log: TextIO, prefix: str):
+    """
+    Copy the output of a subprocess to a log file and the standard output.
+
+    The output is read in chunks, so that long lines without a newline, such
+    as progress bars refreshed with carriage returns, are streamed as well.
+
+    :param stream: Output of the subprocess.
+    :param log: Open log file.
+    :param prefix: Label prepended to the lines echoed to the standard output.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    line_start = True
+    while chunk := await stream.read(2**16):
+        text = decoder.decode(chunk)
+        log.write(text)
+        log.flush()
+        for line in text.splitlines(keepends=True):
+            if line_start:
+                sys.stdout.write(f"[{prefix}] ")
+            sys.stdout.write(line)
+            line_start = line.endswith(("\n", "\r"))
+        sys.stdout.flush()
+
+
+async def kill_process_tree(process: asyncio.subprocess.Process):
+    """
+    Kill a worker subprocess along with the processes it started.
+
+    Wrappers such as 'conda run' start the worker as a child process, which
+    would survive a kill of the wrapper alone.
+
+    :param process: Subprocess started in a new session, or process group on
+        Windows, by :func:`call_worker_subprocess`.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    if sys.platform == "win32":
+        killer = await asyncio.create_subprocess_exec(
+            "taskkill",
+            "/F",
+            "/T",
+            "/PID",
+            str(process.pid),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await killer.wait()
+    else:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+
+    if process.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+
+    await process.wait()
+
+
+async def call_worker_subprocess(
+    uijson: str | Path, timeout: float | None = None
+) -> int:
+    """
+    Runs the worker for the sweep parameters contained in 'uijson' as a subprocess.
+
+    The output of the worker, and any error raised while running it, is
+    written to a '.log' file next to 'uijson'. Unless the worker exits by
+    itself, it is killed with the processes it started when this coroutine
+    exits, including on timeout and cancellation.
+
+    :param uijson: Path to the trial ui.json file.
+    :param timeout: Seconds after which the worker is killed.
+
+    :returns: Return code of the worker.
+
+    :raises asyncio.TimeoutError: If the worker does not finish in time.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    uijson = Path(uijson)
+    name = uijson.name.removesuffix(".ui.json")
+    process: asyncio.subprocess.Process | None = None
+    completed = False
+    options: dict[str, Any] = {"start_new_session": True}
+    if sys.platform == "win32":
+        options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+    async def communicate(log: TextIO) -> int:
+        nonlocal process
+        process = await asyncio.create_subprocess_exec(
+            *worker_command(uijson),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=uijson.parent,
+            **options,
+        )
+        if process.stdout is not None:
+            await stream_output(process.stdout, log, name[:8])
+        return await process.wait()
+
+    with open(uijson.with_name(f"{name}.log"), "w", encoding="utf8") as log:
+        try:
+            code = await asyncio.wait_for(communicate(log), timeout)
+            completed = True
+            return code
+        except asyncio.TimeoutError:
+            log.write(f"Worker killed after exceeding timeout of {timeout} s.\n")
+            raise
+        except Exception as error:
+            log.write(f"Worker failed: {type(error).__name__}: {error}\n")
+            raise
+        finally:
+            if process is not None and not completed:
+                await kill_process_tree(process)
@@ -10,6 +10,7 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 
 from geoh5py.ui_json import InputFile
@@ -39,3 +40,14 @@ class SampleDriver:
         ifile = InputFile.read_ui_json(filepath)
         params = SampleParams(ifile)
         SampleDriver(params).run()
+
+    @classmethod
+    def start_batch(cls, filepath, trials):
+        ifile = InputFile.read_ui_json(filepath)
+        for values in trials.values():
+            ifile.data.update(values)
+            SampleDriver(SampleParams(ifile)).run()
+
+
+if __name__ == "__main__":
+    SampleDriver.start(sys.argv[1])
@@ -20,8 +20,15 @@ from geoh5py.ui_json import InputFile
 from geoh5py.workspace import Workspace
 
 from param_sweeps.constants import default_ui_json
-from param_sweeps.driver import SweepDriver, SweepParams, file_validation, main
+from param_sweeps.driver import (
+    SweepDriver,
+    SweepParams,
+    SweepPlan,
+    file_validation,
+    main,
+)
 from param_sweeps.generate import generate
+from param_sweeps.sample_driver import SampleDriver
 
 
 def test_params(tmp_path: Path):
@@ -72,7 +79,7 @@ def test_file_validation(tmp_path: Path):
         json.dump({}, file)
 
 
-def test_sweep(tmp_path: Path):  # pylint: disable=R0914
+def setup_sweep(tmp_path: Path) -> tuple[Workspace, Path]:
     geoh5_path = tmp_path / "test.geoh5"
     uijson_path = tmp_path / "test.ui.json"
     sweep_path = tmp_path / "test_sweep.ui.json"
@@ -121,11 +128,30 @@ def test_sweep(tmp_path: Path):  # pylint: disable=R0914
         json.dump(uijson, file, indent=4)
 
     workspace.close()
+
+    return workspace, sweep_path
+
+
+def read_lookup(tmp_path: Path) -> dict:
+    with open(tmp_path / "lookup.json", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def set_run_command(tmp_path: Path, run_command: str):
+    """Change the worker module run by the trials of the sweep."""
+    with open(tmp_path / "test.ui.json", encoding="utf-8") as file:
+        uijson = json.load(file)
+    uijson["run_command"] = run_command
+    with open(tmp_path / "test.ui.json", "w", encoding="utf-8") as file:
+        json.dump(uijson, file, indent=4)
+
+
+def test_sweep(tmp_path: Path):
+    workspace, sweep_path = setup_sweep(tmp_path)
     main(sweep_path)
     workspace.open()
 
-    with open(tmp_path / "lookup.json", encoding="utf-8") as file:
-        lookup = json.load(file)
+    lookup = read_lookup(tmp_path)
 
     assert all((tmp_path / f"{k}.ui.geoh5").is_file() for k in lookup)
     assert all((tmp_path / f"{k}.ui.json").is_file() for k in lookup)
@@ -137,3 +163,210 @@ def test_sweep(tmp_path: Path):  # pylint: disable=R0914
         data = file_ws.get_entity("data")[0]
         assert isinstance(data, Points)
         assert any("initial" in k.name for k in data.children)
+
+
+def test_resume(tmp_path: Path):
+    _, sweep_path = setup_sweep(tmp_path)
+    main(sweep_path)
+
+    # Interrupted after the first trial
+    lookup = read_lookup(tmp_path)
+    lookup[list(lookup)[-1]]["status"] = "processing"
+    with open(tmp_path / "lookup.json", "w", encoding="utf-8") as file:
+        json.dump(lookup, file)
+
+    main(sweep_path)
+
+    lookup = read_lookup(tmp_path)
+
+    assert all(trial["status"] == "complete" for trial in lookup.values())
+
+    plan = main(sweep_path, plan=True)
+    assert plan.trials == 2
+    assert plan.remaining == 0
+
+
+def test_resume_failed(tmp_path: Path):
+    _, sweep_path = setup_sweep(tmp_path)
+    main(sweep_path)
+
+    # Worker killed while writing to the workspace
+    lookup = read_lookup(tmp_path)
+    failed = next(iter(lookup))
+    lookup[failed]["status"] = "failed"
+    with open(tmp_path / "lookup.json", "w", encoding="utf-8") as file:
+        json.dump(lookup, file)
+    with open(tmp_path / f"{failed}.ui.geoh5", "wb") as file:
+        file.write(b"corrupt")
+
+    assert main(sweep_path, plan=True).pending == 1
+
+    main(sweep_path)
+
+    assert read_lookup(tmp_path)[failed]["status"] == "complete"
+    file_ws = Workspace(tmp_path / f"{failed}.ui.geoh5")
+    assert isinstance(file_ws.get_entity("data")[0], Points)
+
+
+def test_plan(tmp_path: Path):
+    _, sweep_path = setup_sweep(tmp_path)
+    plan = main(sweep_path, plan=True)
+
+    assert not (tmp_path / "lookup.json").exists()
+    assert plan.trials == 2
+    assert plan.pending == 2
+    assert plan.disk_usage > 2 * (tmp_path / "test.geoh5").stat().st_size
+    assert plan.runtime is None
+    assert plan.fits
+
+    main(sweep_path)
+    with pytest.raises(ValueError, match="subprocesses"):
+        main(sweep_path, plan=True, concurrency=2)
+    with pytest.raises(ValueError, match="subprocesses"):
+        main(sweep_path, timeout=10)
+    plan = main(sweep_path, plan=True, use_subprocess=True, concurrency=2)
+    assert plan.concurrency == 2
+
+    assert plan.pending == 0
+    assert plan.remaining == 0
+    assert plan.disk_usage == 0
+    assert plan.trial_duration is not None
+
+
+def test_plan_projections():
+    plan = SweepPlan(
+        trials=5,
+        pending=5,
+        remaining=3,
+        trial_size=10,
+        disk_free=45,
+        trial_duration=1.5,
+        concurrency=2,
+    )
+    assert plan.runtime == 3.0
+    assert plan.disk_usage == 50
+    assert not plan.fits
+
+    plan.batch_size = 2
+    assert plan.disk_usage == 30
+    assert plan.fits
+
+    plan.trial_duration = None
+    assert plan.runtime is None
+
+
+def test_run_skips_complete_trials(tmp_path: Path, monkeypatch):
+    _, sweep_path = setup_sweep(tmp_path)
+    main(sweep_path)
+
+    read_ui_json = InputFile.read_ui_json
+    paths = []
+
+    def spy(path, **kwargs):
+        paths.append(Path(path))
+        return read_ui_json(path, **kwargs)
+
+    monkeypatch.setattr(InputFile, "read_ui_json", staticmethod(spy))
+    main(sweep_path)
+
+    lookup = read_lookup(tmp_path)
+
+    assert paths.count(sweep_path) == 1
+    assert not any(path.name == f"{k}.ui.json" for path in paths for k in lookup)
+
+
+def test_sweep_subprocess(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", default_ui_json["conda_environment"])
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parents[1]))
+    _, sweep_path = setup_sweep(tmp_path)
+    main(sweep_path, use_subprocess=True, concurrency=2, timeout=60)
+
+    lookup = read_lookup(tmp_path)
+
+    assert all(trial["status"] == "complete" for trial in lookup.values())
+    assert all("duration" in trial for trial in lookup.values())
+    for name, trial in lookup.items():
+        with open(tmp_path / f"{name}.log", encoding="utf-8") as file:
+            assert file.read().strip() == str(trial["param"])
+
+
+def test_sweep_subprocess_timeout(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", default_ui_json["conda_environment"])
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    with open(tmp_path / "slow_worker.py", "w", encoding="utf-8") as file:
+        file.write("import time\ntime.sleep(60)\n")
+
+    _, sweep_path = setup_sweep(tmp_path)
+    set_run_command(tmp_path, "slow_worker")
+
+    with pytest.warns(UserWarning, match="2 of 2 trials failed"):
+        main(sweep_path, use_subprocess=True, concurrency=2, timeout=0.5)
+
+    lookup = read_lookup(tmp_path)
+
+    assert all(trial["status"] == "failed" for trial in lookup.values())
+    for name in lookup:
+        with open(tmp_path / f"{name}.log", encoding="utf-8") as file:
+            assert "timeout" in file.read()
+
+
+def test_sweep_subprocess_errors(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", default_ui_json["conda_environment"])
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    with open(tmp_path / "progress_worker.py", "w", encoding="utf-8") as file:
+        file.write("print('\\r'.join(['#' * 80] * 2000), end='\\r')\nprint('done')\n")
+
+    _, sweep_path = setup_sweep(tmp_path)
+    set_run_command(tmp_path, "progress_worker")
+
+    driver = SweepDriver(
+        SweepParams.from_input_file(InputFile.read_ui_json(sweep_path))
+    )
+    corrupt, valid = read_lookup(tmp_path)
+    with open(tmp_path / f"{corrupt}.ui.json", "w", encoding="utf-8") as file:
+        file.write("{")
+
+    with pytest.warns(UserWarning, match="1 of 2 trials failed"):
+        driver.run_subprocess(concurrency=2)
+
+    lookup = read_lookup(tmp_path)
+
+    assert lookup[corrupt]["status"] == "failed"
+    assert lookup[valid]["status"] == "complete"
+    with open(tmp_path / f"{corrupt}.log", encoding="utf-8") as file:
+        assert "JSONDecodeError" in file.read()
+    with open(tmp_path / f"{valid}.log", encoding="utf-8", newline="") as file:
+        assert file.read().endswith("\rdone\n")
+
+
+def test_sweep_batch(tmp_path: Path, capsys):
+    _, sweep_path = setup_sweep(tmp_path)
+    plan = main(sweep_path, plan=True, batch_size=2)
+    assert plan.disk_usage == plan.trial_size
+
+    main(sweep_path, batch_size=2)
+
+    lookup = read_lookup(tmp_path)
+
+    batch = SweepDriver.uuid_from_trials(list(lookup))
+    assert all(trial["status"] == "complete" for trial in lookup.values())
+    assert all(trial["batch"] == batch for trial in lookup.values())
+    assert (tmp_path / f"{batch}.ui.geoh5").is_file()
+    assert not any((tmp_path / f"{k}.ui.geoh5").is_file() for k in lookup)
+    assert capsys.readouterr().out.split()[-2:] == ["1", "2"]
+
+    with pytest.raises(ValueError, match="subprocesses"):
+        main(sweep_path, use_subprocess=True, batch_size=2)
+
+
+def test_sweep_batch_without_start_batch(tmp_path: Path, monkeypatch):
+    monkeypatch.delattr(SampleDriver, "start_batch")
+    _, sweep_path = setup_sweep(tmp_path)
+
+    with pytest.raises(ValueError, match="start_batch"):
+        main(sweep_path, plan=True, batch_size=2)
+
+    with pytest.raises(ValueError, match="start_batch"):
+        main(sweep_path, batch_size=2)
+
+    assert not list(tmp_path.glob("*.ui.geoh5"))
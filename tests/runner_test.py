@@ -0,0 +1,62 @@
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2022-2025 Mira Geoscience Ltd.                                   '
+#                                                                                 '
+#  This file is part of param-sweeps package.                                     '
+#                                                                                 '
+#  param-sweeps is distributed under the terms and conditions of the MIT License  '
+#  (see LICENSE file at the root of this source code package).                    '
+#                                                                                 '
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from param_sweeps.runner import call_worker_subprocess, worker_command
+
+
+def test_worker_command(tmp_path: Path, monkeypatch):
+    uijson = tmp_path / "trial.ui.json"
+    with open(uijson, "w", encoding="utf-8") as file:
+        json.dump(
+            {"run_command": "some.worker", "conda_environment": "worker_env"}, file
+        )
+
+    monkeypatch.setenv("CONDA_EXE", "conda")
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", "worker_env")
+    assert worker_command(uijson)[1:] == ["-m", "some.worker", str(uijson)]
+
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", "param_sweeps")
+    command = worker_command(uijson)
+    assert command[:5] == ["conda", "run", "--no-capture-output", "-n", "worker_env"]
+    assert command[-3:] == ["-m", "some.worker", str(uijson)]
+
+    monkeypatch.delenv("CONDA_EXE")
+    monkeypatch.setattr("shutil.which", lambda _: None)
+    with pytest.warns(UserWarning, match="worker_env"):
+        command = worker_command(uijson)
+    assert command[1:] == ["-m", "some.worker", str(uijson)]
+
+
+def test_timeout_kills_worker_children(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    with open(tmp_path / "wrapper_worker.py", "w", encoding="utf-8") as file:
+        file.write(
+            "import subprocess, sys\n"
+            "subprocess.run([sys.executable, '-c', "
+            '\'import time; time.sleep(2); open("orphan.txt", "w").close()\'])\n'
+        )
+
+    uijson = tmp_path / "trial.ui.json"
+    with open(uijson, "w", encoding="utf-8") as file:
+        json.dump({"run_command": "wrapper_worker"}, file)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(call_worker_subprocess(uijson, timeout=1))
+
+    time.sleep(2)
+    assert not (tmp_path / "orphan.txt").exists()
@@ -0,0 +1,50 @@
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+#  Copyright (c) 2022-2025 Mira Geoscience Ltd.                                   '
+#                                                                                 '
+#  This file is part of param-sweeps package.                                     '
+#                                                                                 '
+#  param-sweeps is distributed under the terms and conditions of the MIT License  '
+#  (see LICENSE file at the root of this source code package).                    '
+#                                                                                 '
+# '''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''''
+
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["param_sweeps.driver", "param_sweeps.generate"])
+def test_cli_import_is_lazy(module: str):
+    """Importing a CLI entry point must not pull in geoh5py, numpy or asyncio."""
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('geoh5py', 'numpy', 'asyncio') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize("module", ["param_sweeps.driver", "param_sweeps.generate"])
+def test_cli_import_time(module: str):
+    """Importing a CLI entry point costs a fraction of importing geoh5py."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}, geoh5py"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {
+        line.split("|")[-1].strip(): int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+    assert times[module] < times["geoh5py"] / 2